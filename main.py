@@ -1,19 +1,98 @@
 import asyncio
-import threading
+from collections import OrderedDict
+import logging
+import logging.handlers
+import math
+import os
+import queue
 import sys
 import signal
+import time
 from typing import Optional, Any, cast
 import tkinter as tk
 from tkinter import messagebox
 import traceback
-from concurrent.futures import Future
 
 # Requires bleak (pip install bleak)
 try:
     from bleak import BleakClient, BleakScanner
+    from bleak.exc import BleakError
 except Exception:
     BleakClient = None
     BleakScanner = None
+    BleakError = Exception
+
+# Identical errors (same exception type and text) within this many seconds are counted, not logged again
+ERROR_REPEAT_WINDOW = 1.0
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    # The stock QueueHandler formats the record (traceback included) in the calling thread.
+    # The queue never leaves this process, so hand the record over as-is and let the
+    # listener thread's file handler do the formatting.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _RepeatFilter(logging.Filter):
+    # Collapses bursts of the same error (e.g. every write failing on a flaky link) into a counter.
+    # A burst ends once no identical error has been seen for `window` seconds; its count is then
+    # written as a separate record, on the next record of any kind or on flush().
+    def __init__(self, target: logging.Logger, window: float = ERROR_REPEAT_WINDOW, max_keys: int = 32):
+        super().__init__()
+        self.target = target
+        self.window = window
+        self.max_keys = max_keys
+        # (exception type name, exception text) -> [time last seen, suppressed count]
+        self._seen: OrderedDict = OrderedDict()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        self.flush(now)
+        exc = record.exc_info[1] if record.exc_info else None
+        if exc is None:
+            return True
+        key = (type(exc).__name__, str(exc))
+        entry = self._seen.get(key)
+        if entry is not None and now - entry[0] < self.window:
+            entry[0] = now
+            entry[1] += 1
+            self._seen.move_to_end(key)
+            return False
+        self._seen[key] = [now, 0]
+        self._seen.move_to_end(key)
+        while len(self._seen) > self.max_keys:
+            old_key, (_, count) = self._seen.popitem(last=False)
+            self._report(old_key, count)
+        return True
+
+    def flush(self, now: Optional[float] = None):
+        # Report bursts whose window has expired; with no time given, report everything pending
+        for key, entry in self._seen.items():
+            if entry[1] and (now is None or now - entry[0] >= self.window):
+                self._report(key, entry[1])
+                entry[1] = 0
+
+    def _report(self, key: tuple[str, str], count: int):
+        if not count:
+            return
+        record = self.target.makeRecord(
+            self.target.name, logging.ERROR, __file__, 0,
+            '%s: %s repeated %d more time(s)', (key[0], key[1], count), None,
+        )
+        # straight to the handlers so the summary doesn't pass through this filter again
+        self.target.callHandlers(record)
+
+
+# Errors go to main_error.log through a queue; the file is written by a QueueListener thread,
+# never by the asyncio loop itself (see _start_error_log)
+ERROR_LOG_FILE = 'main_error.log'
+logger = logging.getLogger("ardubot")
+_log_queue: queue.Queue = queue.Queue()
+logger.addHandler(_DeferredQueueHandler(_log_queue))
+_repeat_filter = _RepeatFilter(logger)
+logger.addFilter(_repeat_filter)
+logger.propagate = False
 
 # We deliberately avoid monkeypatching BleakClient or client instances here.
 # Different bleak versions expose services differently (async get_services vs .services),
@@ -23,28 +102,111 @@ DEVICE_NAME = "ardubotr4"
 # Match Arduino sketch UUIDs
 ROBOT_SERVICE_UUID = "19B10000-E8F2-537E-4F6C-D104768A1214"
 COMMAND_CHAR_UUID = "19B10001-E8F2-537E-4F6C-D104768A1214"
+# Lower-cased once; characteristic lookups key on lower-case UUID strings
+_CMD_UUID_KEY = COMMAND_CHAR_UUID.lower()
 # Commands mapping (you can change the payloads to match your device expectations)
-REQUIRE_RESPONSE_ON_WRITE = True
-COMMANDS = {
+# Motor commands are fire-and-forget; write-without-response is used whenever the characteristic supports it
+REQUIRE_RESPONSE_ON_WRITE = False
+# Commands that are always written with response so the toggle is acknowledged by the robot
+ACKED_COMMANDS = {"switch"}
+# Payloads are plain text (no newline), encoded once here rather than on every press
+COMMANDS = {k: v.encode("utf-8") for k, v in {
     "forward": "forward",
     "back": "back",
     "left": "left",
     "right": "right",
     "switch": "switch",
-}
+}.items()}
+# Bounds (ms) for how long Tk waits before handing control to the asyncio loop again;
+# the short end is used while work is pending, the long end when the loop is idle
+LOOP_TICK_MIN_MS = 5
+LOOP_TICK_MAX_MS = 100
+# Identical presses closer together than this (seconds) are coalesced into one write
+DEBOUNCE_INTERVAL = 0.05
+# How long (seconds) to scan for the robot; the scan returns early once it is seen.
+# Override with the ARDUBOT_SCAN_TIMEOUT environment variable in noisy RF environments.
+DEFAULT_SCAN_TIMEOUT = 2.5
+
+
+def _scan_timeout_from_env() -> float:
+    # Only a finite, positive number of seconds is accepted; anything else falls back to the default
+    try:
+        value = float(os.environ.get("ARDUBOT_SCAN_TIMEOUT", DEFAULT_SCAN_TIMEOUT))
+    except ValueError:
+        return DEFAULT_SCAN_TIMEOUT
+    if not math.isfinite(value) or value <= 0:
+        return DEFAULT_SCAN_TIMEOUT
+    return value
+
+
+SCAN_TIMEOUT = _scan_timeout_from_env()
+# Upper bound (seconds) on any single BLE disconnect during cleanup or shutdown
+DISCONNECT_TIMEOUT = 3.0
+# Last successfully connected address and characteristic UUID, one per line
+DEVICE_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".ardubotr4_addr")
+# How long to wait on a direct connect to the cached address before falling back to scanning
+CACHED_CONNECT_TIMEOUT = 2.0
+
+
+def _start_error_log() -> logging.handlers.QueueListener:
+    file_handler = logging.handlers.RotatingFileHandler(
+        ERROR_LOG_FILE, maxBytes=1_000_000, backupCount=2, encoding='utf-8', delay=True
+    )
+    file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    listener = logging.handlers.QueueListener(_log_queue, file_handler)
+    listener.start()
+    return listener
+
+
+def _load_cached_device() -> tuple[Optional[str], Optional[str]]:
+    try:
+        with open(DEVICE_CACHE_FILE, 'r', encoding='utf-8') as fh:
+            lines = [line.strip() for line in fh.read().splitlines()]
+    except OSError:
+        return None, None
+    address = lines[0] if len(lines) > 0 and lines[0] else None
+    char_uuid = lines[1] if len(lines) > 1 and lines[1] else None
+    return address, char_uuid
+
+
+def _save_cached_device(address: Optional[str], char_uuid: Optional[str]):
+    if not address:
+        return
+    try:
+        with open(DEVICE_CACHE_FILE, 'w', encoding='utf-8') as fh:
+            fh.write(address + '\n')
+            fh.write((char_uuid or '') + '\n')
+    except OSError as e:
+        print(f"DEBUG: could not save device cache: {e}", file=sys.stderr, flush=True)
 
 
 class BLEController:
+    # Command characteristic UUID found by the first successful discovery; reused by later connects
+    _discovered_char_uuid: Optional[str] = None
+
     def __init__(self, loop: asyncio.AbstractEventLoop):
         self.loop = loop
         # Use a generic Any type here so static checkers won't complain about backend-specific methods
         self.client: Optional[Any] = None
+        # client.write_gatt_char, bound at connect time
+        self._write: Optional[Any] = None
         self.char_uuid: Optional[str] = None
+        # Characteristic object found during discovery; lets bleak skip its UUID lookup per write
+        self.char_obj: Optional[Any] = None
         self.address: Optional[str] = None
+        # BLEDevice from the last successful scan, reused for in-session reconnects
+        self._device: Optional[Any] = None
+        # Address/char UUID saved by a previous session; read once here, off the connect path
+        self._cached_address, self._cached_char_uuid = _load_cached_device()
+        # True when the chosen characteristic advertises write-without-response
+        self._prefers_wor = False
+        self.mtu: Optional[int] = None
+        # True when char_uuid came from _discovered_char_uuid rather than this connection's discovery
+        self._char_from_cache = False
         self.connected = False
         self._lock = asyncio.Lock()
 
-    async def scan_and_connect(self, name: str, timeout: float = 5.0) -> bool:
+    async def scan_and_connect(self, name: str, timeout: float = SCAN_TIMEOUT) -> bool:
         if BleakScanner is None:
             raise RuntimeError("bleak is not installed")
 
@@ -52,96 +214,244 @@ class BLEController:
             if self.connected:
                 return True
 
-            devices = await BleakScanner.discover(timeout=timeout)
-            target = None
-            for d in devices:
-                if d.name and d.name.lower() == name.lower():
-                    target = d
-                    break
-
-            if not target:
-                return False
-
-            self.address = target.address
-            # create BleakClient and cast to Any to keep static analyzers from complaining
-            client = cast(Any, BleakClient(self.address, loop=self.loop))
-            try:
-                # debug trace
-                print(f"DEBUG: scan_and_connect -> connecting to {self.address}", file=sys.stderr, flush=True)
+            client = None
+            cached_address, cached_char_uuid = self._cached_address, self._cached_char_uuid
+            # Within a session, reuse the BLEDevice from the last scan: bleak connects to it without
+            # scanning. Across sessions only the saved address is known, and bleak still scans for it
+            # inside connect(). Either attempt is capped; if it fails the name scan below still gets
+            # its full timeout, so a slow first advertisement isn't reported as "not found".
+            cached_target = self._device or cached_address
+            if cached_target:
+                print(f"DEBUG: scan_and_connect -> trying cached device {cached_target}", file=sys.stderr, flush=True)
+                candidate = cast(Any, BleakClient(cached_target, loop=self.loop))
                 try:
-                    await client.connect()
-                except RecursionError as re:
-                    tb = ''.join(traceback.format_exception(type(re), re, re.__traceback__))
-                    with open('main_error.log', 'w', encoding='utf-8') as fh:
-                        fh.write('RecursionError during client.connect():\n')
-                        fh.write(tb)
-                    print('RecursionError captured during connect to main_error.log', file=sys.stderr)
+                    await self._connect_client(candidate, timeout=CACHED_CONNECT_TIMEOUT)
+                    client = candidate
+                    self.address = getattr(cached_target, 'address', cached_target)
+                except RecursionError:
                     raise
+                except asyncio.CancelledError:
+                    # cancelled mid-connect (app closing): don't leave the link half up
+                    try:
+                        await asyncio.wait_for(candidate.disconnect(), timeout=DISCONNECT_TIMEOUT)
+                    except Exception:
+                        pass
+                    raise
+                except Exception as e:
+                    print(f"DEBUG: cached connect failed ({e!r}), falling back to scan", file=sys.stderr, flush=True)
+                    try:
+                        await asyncio.wait_for(candidate.disconnect(), timeout=DISCONNECT_TIMEOUT)
+                    except Exception:
+                        pass
+                    cached_char_uuid = None
+                    self._device = None
+
+            connected_from_cache = client is not None
+            if client is None:
+                # Stop scanning as soon as the robot advertises instead of waiting out the full timeout
+                wanted = name.lower()
+                target = await BleakScanner.find_device_by_filter(
+                    lambda d, ad: bool(d.name) and d.name.lower() == wanted,
+                    timeout=timeout,
+                )
+
+                if not target:
+                    return False
+
+                self._device = target
+                self.address = target.address
+                # create BleakClient and cast to Any to keep static analyzers from complaining
+                client = cast(Any, BleakClient(self.address, loop=self.loop))
+            try:
+                if not connected_from_cache:
+                    # debug trace
+                    print(f"DEBUG: scan_and_connect -> connecting to {self.address}", file=sys.stderr, flush=True)
+                    await self._connect_client(client)
                 print("DEBUG: connected", file=sys.stderr, flush=True)
 
-                # Discover services via client.services (no direct get_services call); retry briefly
-                services = getattr(client, "services", None)
-                retries = 0
-                while not services and retries < 10:
-                    await asyncio.sleep(0.1)
+                # BlueZ doesn't exchange MTU on connect; ask for it so larger payloads aren't fragmented.
+                # Other backends negotiate during connect and just report mtu_size.
+                backend = getattr(client, "_backend", None)
+                if backend is not None and hasattr(backend, "_acquire_mtu"):
+                    try:
+                        await backend._acquire_mtu()
+                    except Exception as e:
+                        print(f"DEBUG: MTU exchange failed: {e}", file=sys.stderr, flush=True)
+                self.mtu = getattr(client, "mtu_size", None)
+                print(f"DEBUG: MTU {self.mtu}", file=sys.stderr, flush=True)
+
+                self.client = client
+                # Bound once here so the send path skips the attribute lookup on every write
+                self._write = client.write_gatt_char
+                known_char_uuid = BLEController._discovered_char_uuid
+                if known_char_uuid:
+                    # Characteristic was found on an earlier connect in this session; skip the
+                    # services wait and walk, and only resolve the object if bleak already has it
                     services = getattr(client, "services", None)
-                    retries += 1
-                if services:
-                    print("DEBUG: services present after connect", file=sys.stderr, flush=True)
+                    chosen_char = self._lookup_char(services, known_char_uuid) if services else None
+                    self._use_char(known_char_uuid, chosen_char)
+                    self._char_from_cache = True
                 else:
-                    print("DEBUG: services not populated, will proceed with known UUID", file=sys.stderr, flush=True)
-
-                chosen_char_uuid = None
-                if services:
-                    # Prefer exact known characteristic UUID
-                    uuid_target = COMMAND_CHAR_UUID.lower()
-                    for svc in services:
-                        for ch in getattr(svc, 'characteristics', []):
-                            if getattr(ch, 'uuid', '').lower() == uuid_target:
-                                chosen_char_uuid = ch.uuid
-                                break
-                        if chosen_char_uuid:
-                            break
-                    # If not found, fallback to any writable char
-                    if not chosen_char_uuid:
-                        for svc in services:
-                            for ch in getattr(svc, 'characteristics', []):
-                                props = getattr(ch, 'properties', []) or []
-                                if 'write' in props or 'write-without-response' in props:
-                                    chosen_char_uuid = ch.uuid
-                                    break
-                            if chosen_char_uuid:
-                                break
-
-                # Finalize selection
-                self.client = client
-                self.char_uuid = chosen_char_uuid or COMMAND_CHAR_UUID
+                    # client.services is already filled in by connect(); resolve the characteristic inline
+                    self._char_from_cache = False
+                    self._select_char(client, cached_char_uuid)
                 print(f"DEBUG: using char {self.char_uuid}", file=sys.stderr, flush=True)
                 self.connected = True
+                self._remember_device()
                 return True
-            except Exception:
+            except (Exception, asyncio.CancelledError):
+                self.client = None
+                self._write = None
                 try:
-                    await client.disconnect()
+                    await asyncio.wait_for(client.disconnect(), timeout=DISCONNECT_TIMEOUT)
                 except Exception:
                     pass
                 raise
 
+    def _remember_device(self):
+        if (self.address, self.char_uuid) == (self._cached_address, self._cached_char_uuid):
+            return
+        self._cached_address, self._cached_char_uuid = self.address, self.char_uuid
+        # file write happens on a worker thread so the loop (and with it the Tk UI) never blocks on disk
+        self.loop.run_in_executor(None, _save_cached_device, self.address, self.char_uuid)
+
+    @staticmethod
+    async def _connect_client(client: Any, timeout: Optional[float] = None):
+        try:
+            await asyncio.wait_for(client.connect(), timeout=timeout)
+        except RecursionError:
+            logger.exception('RecursionError during client.connect()')
+            print('RecursionError captured during connect to main_error.log', file=sys.stderr)
+            raise
+
+    def _select_char(self, client: Any, cached_char_uuid: Optional[str]):
+        # Check client.services once (no direct get_services call). If bleak hasn't populated
+        # it, don't wait: COMMAND_CHAR_UUID is known and write_gatt_char accepts it as-is.
+        services = getattr(client, "services", None)
+        if not services:
+            print("DEBUG: services not populated, will proceed with known UUID", file=sys.stderr, flush=True)
+            self._use_char(COMMAND_CHAR_UUID, None)
+            return
+
+        chosen_char = None
+        if cached_char_uuid:
+            # Remembered characteristic from the last session; bleak resolves it without walking services
+            chosen_char = self._lookup_char(services, cached_char_uuid)
+        if chosen_char is None:
+            chosen_char = self._find_char(services)
+        if chosen_char is None:
+            self._use_char(COMMAND_CHAR_UUID, None)
+            return
+
+        # Finalize selection
+        self._use_char(chosen_char.uuid, chosen_char)
+        BLEController._discovered_char_uuid = chosen_char.uuid
+
+    @staticmethod
+    def _lookup_char(services: Any, char_uuid: str) -> Optional[Any]:
+        if not hasattr(services, 'get_characteristic'):
+            return None
+        try:
+            return services.get_characteristic(char_uuid)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _find_char(services: Any) -> Optional[Any]:
+        # Index every characteristic once by lower-cased UUID
+        chars = {
+            getattr(ch, 'uuid', '').lower(): ch
+            for svc in services
+            for ch in getattr(svc, 'characteristics', [])
+        }
+        # Prefer exact known characteristic UUID
+        ch = chars.get(_CMD_UUID_KEY)
+        if ch is not None:
+            return ch
+        # If not found, fallback to any writable char
+        writable = {'write', 'write-without-response'}
+        return next((c for c in chars.values() if writable.intersection(getattr(c, 'properties', None) or ())), None)
+
+    def _use_char(self, char_uuid: str, char_obj: Optional[Any]):
+        self.char_uuid = char_uuid
+        self.char_obj = char_obj
+        props = getattr(char_obj, 'properties', []) or []
+        self._prefers_wor = 'write-without-response' in props
+
     async def disconnect(self):
         async with self._lock:
-            if self.client and self.connected:
+            client = self.client
+            # Flip the flag before awaiting so a concurrent send() sees us as disconnected
+            self.connected = False
+            if client:
                 try:
-                    await self.client.disconnect()
+                    await client.disconnect()
                 except Exception:
                     pass
             self.client = None
+            self._write = None
             self.char_uuid = None
-            self.connected = False
+            self.char_obj = None
+            self._prefers_wor = False
+            self.mtu = None
+            self._char_from_cache = False
 
     async def send(self, payload: bytes, require_response: bool = False):
-        async with self._lock:
-            if not (self.client and self.connected and self.char_uuid):
-                raise RuntimeError("Not connected")
-            await self.client.write_gatt_char(self.char_uuid, payload, response=require_response)
+        # No lock here: UI presses arrive one at a time and connect/disconnect hold the lock themselves
+        client = self.client
+        write = self._write
+        if not (client and write and self.connected and self.char_uuid):
+            raise RuntimeError("Not connected")
+        # Skip the ATT write-response round trip unless the caller asked for it or the char can't do without
+        response = require_response or not self._prefers_wor
+        # Pass the characteristic object when we have it so bleak doesn't resolve the UUID on every write
+        try:
+            await write(self.char_obj or self.char_uuid, payload, response=response)
+        except BleakError:
+            if not self._rediscover_char(client):
+                raise
+            response = require_response or not self._prefers_wor
+            await write(self.char_obj, payload, response=response)
+
+    def _rediscover_char(self, client: Any) -> bool:
+        # A write failed. If the characteristic came from _discovered_char_uuid its handles may be
+        # stale: forget it and look it up again. Returns True when the caller should retry once.
+        if not self._char_from_cache:
+            return False
+        print("DEBUG: write with cached char failed, rediscovering", file=sys.stderr, flush=True)
+        BLEController._discovered_char_uuid = None
+        self._char_from_cache = False
+        services = getattr(client, "services", None)
+        chosen_char = self._find_char(services) if services else None
+        if chosen_char is None:
+            return False
+        self._use_char(chosen_char.uuid, chosen_char)
+        BLEController._discovered_char_uuid = chosen_char.uuid
+        return True
+
+    async def send_batch(self, payloads: list[bytes]):
+        # Composite commands: everything but the last payload goes out as write-without-response
+        # (when the characteristic supports it) and only the last write waits for an ACK.
+        # bleak queues the writes on the GATT connection in the order the coroutines start.
+        if not payloads:
+            return
+        client = self.client
+        write = self._write
+        if not (client and write and self.connected and self.char_uuid):
+            raise RuntimeError("Not connected")
+        try:
+            await self._write_batch(write, payloads)
+        except BleakError:
+            # same stale-characteristic recovery as send(); the whole batch is retried once
+            if not self._rediscover_char(client):
+                raise
+            await self._write_batch(write, payloads)
+
+    async def _write_batch(self, write: Any, payloads: list[bytes]):
+        target = self.char_obj or self.char_uuid
+        head_response = not self._prefers_wor
+        await asyncio.gather(*(write(target, p, response=head_response) for p in payloads[:-1]))
+        await write(target, payloads[-1], response=True)
 
 
 class App:
@@ -149,75 +459,96 @@ class App:
         self.root = root
         self.root.title("Ardubotr4 BLE Controller")
 
-        # Asyncio loop in background thread
+        # Asyncio loop driven from Tk's event loop (see _tick); no background thread
         self.loop = asyncio.new_event_loop()
-        self.loop_thread = threading.Thread(target=self._run_loop, daemon=True)
-        self.loop_thread.start()
+        asyncio.set_event_loop(self.loop)
+        self.loop.set_exception_handler(self._loop_exception_handler)
+        # Pending Tk after() id for the next _tick
+        self._tick_id: Optional[str] = None
+        # Set once the window is closing; tasks stop touching Tk widgets after that
+        self._closed = False
 
         self.ble = BLEController(self.loop)
 
         self.status_var = tk.StringVar(value="Not connected")
 
+        # (command name, monotonic time) of the last press, for debouncing
+        self._last_cmd: tuple[Optional[str], float] = (None, 0.0)
+        # Presses are queued as (payload, require_response) and written in order by a single worker task
+        self._cmd_queue: asyncio.Queue = asyncio.Queue()
+        # True while the worker is awaiting a BLE write (keeps the loop ticking fast)
+        self._worker_busy = False
+
         self._build_ui()
 
+        self._worker_task = self._schedule_coroutine(self._command_worker())
+
         # try to auto-connect
         self._schedule_coroutine(self._connect_and_update())
 
         # handle close
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
-    def _run_loop(self):
-        asyncio.set_event_loop(self.loop)
-        # set a custom exception handler to capture unhandled exceptions in background tasks
-        def _loop_exception_handler(loop, context):
-            try:
-                msg = context.get('message') or ''
-                exc = context.get('exception')
-                with open('main_error.log', 'a', encoding='utf-8') as fh:
-                    fh.write('Loop exception: ' + str(msg) + '\n')
-                    if exc is not None:
-                        fh.write('\n'.join(traceback.format_exception(type(exc), exc, exc.__traceback__)))
-                    else:
-                        fh.write(str(context) + '\n')
-                print('Logged loop exception to main_error.log', file=sys.stderr)
-            except Exception:
-                pass
-
-        self.loop.set_exception_handler(_loop_exception_handler)
-        try:
-            self.loop.run_forever()
-        finally:
-            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
-            self.loop.close()
+    def _tick(self):
+        # Run one pass of the asyncio loop (everything currently ready), then yield back to Tk
+        self._tick_id = None
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        self._tick_id = self.root.after(self._next_tick_delay(), self._tick)
+
+    def _next_tick_delay(self) -> int:
+        # Peeks at loop internals (_ready/_scheduled) of the stdlib base event loop to pick the next wakeup
+        loop = self.loop
+        # the idle command worker is always pending on the queue, so it only counts while busy
+        busy = self._worker_busy or any(t is not self._worker_task for t in asyncio.all_tasks(loop))
+        if getattr(loop, '_ready', None) or busy:
+            # callbacks queued or tasks waiting on BLE I/O: poll fast so completions aren't delayed
+            return LOOP_TICK_MIN_MS
+        scheduled = getattr(loop, '_scheduled', None)
+        if scheduled:
+            delay_ms = (scheduled[0].when() - loop.time()) * 1000
+            return int(min(max(delay_ms, LOOP_TICK_MIN_MS), LOOP_TICK_MAX_MS))
+        return LOOP_TICK_MAX_MS
+
+    def _wake_loop(self):
+        # New work was queued: run the loop right away instead of waiting out an idle tick.
+        # Inside a tick the loop is running and _tick reschedules itself once the pass ends.
+        if self.loop.is_running():
+            return
+        if self._tick_id is not None:
+            self.root.after_cancel(self._tick_id)
+        self._tick_id = self.root.after(0, self._tick)
+
+    @staticmethod
+    def _loop_exception_handler(loop, context):
+        # custom exception handler to capture unhandled exceptions in background tasks
+        msg = context.get('message') or ''
+        exc = context.get('exception')
+        if exc is not None:
+            logger.error('Loop exception: %s', msg, exc_info=exc)
+        else:
+            logger.error('Loop exception: %s %r', msg, context)
+        print('Logged loop exception to main_error.log', file=sys.stderr)
 
     def _schedule_coroutine(self, coro):
-        # Schedule coroutine on background loop and return future
-        fut = asyncio.run_coroutine_threadsafe(coro, self.loop)
-        # attach done callback to log exceptions from the future
-        def _on_done(f: Future):
-            try:
-                exc = f.exception()
-            except Exception:
-                exc = None
+        # Schedule coroutine on the loop and return its task
+        fut = self.loop.create_task(coro)
+        self._wake_loop()
+        # attach done callback to log exceptions from the task
+        def _on_done(f: asyncio.Task):
+            if f.cancelled():
+                return
+            exc = f.exception()
             if exc is not None:
-                try:
-                    tb = ''.join(traceback.format_exception(type(exc), exc, exc.__traceback__))
-                    with open('main_error.log', 'a', encoding='utf-8') as fh:
-                        fh.write('Task exception:\n')
-                        fh.write(tb)
-                    print('Task exception logged to main_error.log', file=sys.stderr)
-                except Exception:
-                    pass
-        try:
-            fut.add_done_callback(_on_done)
-        except Exception:
-            pass
+                logger.error('Task exception', exc_info=exc)
+                print('Task exception logged to main_error.log', file=sys.stderr)
+        fut.add_done_callback(_on_done)
         return fut
 
     async def _connect_and_update(self):
         self._set_status("Scanning for %s..." % DEVICE_NAME)
         try:
-            ok = await self.ble.scan_and_connect(DEVICE_NAME, timeout=5.0)
+            ok = await self.ble.scan_and_connect(DEVICE_NAME, timeout=SCAN_TIMEOUT)
             if ok:
                 self._set_status(f"Connected to {DEVICE_NAME}")
             else:
@@ -226,10 +557,10 @@ class App:
             self._set_status(f"Connection error: {e}")
 
     def _set_status(self, txt: str):
-        def _update():
-            self.status_var.set(txt)
-        # pass callable directly (no args)
-        self.root.after(0, _update)
+        # tasks run on the Tk thread, so the variable can be updated directly
+        if self._closed:
+            return
+        self.status_var.set(txt)
 
     def _build_ui(self):
         frame = tk.Frame(self.root, padx=10, pady=10)
@@ -261,28 +592,41 @@ class App:
         btn_disconnect.pack(side="left", padx=5)
 
     def on_button(self, name: str):
-        base = COMMANDS.get(name)
-        if not base:
+        payload = COMMANDS.get(name)
+        if payload is None:
             messagebox.showerror("Error", f"Unknown command: {name}")
             return
-        # Build payload: plain text command (no newline)
-        payload = base.encode("utf-8")
-
-        future = self._schedule_coroutine(self._send_command(payload))
 
-        def _on_done(fut):
+        now = time.monotonic()
+        if name == self._last_cmd[0] and now - self._last_cmd[1] < DEBOUNCE_INTERVAL:
+            return
+        self._last_cmd = (name, now)
+
+        # Every press is its own action on the robot (e.g. a 300 ms turn), so presses are sent
+        # in order; only the debounce above coalesces them
+        require_response = REQUIRE_RESPONSE_ON_WRITE or name in ACKED_COMMANDS
+        self._cmd_queue.put_nowait((payload, require_response))
+        self._wake_loop()
+
+    async def _command_worker(self):
+        # Single long-lived consumer so presses don't each create their own task
+        while True:
+            payload, require_response = await self._cmd_queue.get()
+            self._worker_busy = True
             try:
-                res = fut.result()
+                await self._send_command(payload, require_response)
             except Exception as e:
+                logger.error('Send exception', exc_info=e)
                 self._set_status(f"Send error: {e}")
-        future.add_done_callback(_on_done)
+            finally:
+                self._worker_busy = False
 
-    async def _send_command(self, payload: bytes):
+    async def _send_command(self, payload: bytes, require_response: bool = REQUIRE_RESPONSE_ON_WRITE):
         if not self.ble.connected:
             # try to connect first
             ok = False
             try:
-                ok = await self.ble.scan_and_connect(DEVICE_NAME, timeout=5.0)
+                ok = await self.ble.scan_and_connect(DEVICE_NAME, timeout=SCAN_TIMEOUT)
             except Exception as e:
                 self._set_status(f"Connection error: {e}")
                 raise
@@ -292,7 +636,7 @@ class App:
                 raise RuntimeError("Device not connected")
 
         try:
-            await self.ble.send(payload, require_response=REQUIRE_RESPONSE_ON_WRITE)
+            await self.ble.send(payload, require_response=require_response)
             shown = payload.decode('utf-8', errors='replace')
             self._set_status(f"Sent: {shown}")
         except Exception as e:
@@ -300,22 +644,44 @@ class App:
             raise
 
     def on_close(self):
-        # schedule disconnect and stop loop
+        # close the window right away; the BLE teardown runs in shutdown() once mainloop returns
         if messagebox.askokcancel("Quit", "Do you want to quit?"):
-            try:
-                fut = self._schedule_coroutine(self.ble.disconnect())
-                fut.result(timeout=3)
-            except Exception:
-                pass
-            # stop loop: pass callable directly
-            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._closed = True
             self.root.destroy()
 
+    def shutdown(self):
+        self._closed = True
+        # Unwind the worker and any in-flight connect/send first: they may hold the BLE lock,
+        # which would leave disconnect() waiting until its timeout
+        tasks = [t for t in asyncio.all_tasks(self.loop) if not t.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            # asyncio.wait only waits, it never blocks on a task that won't finish unwinding
+            self.loop.run_until_complete(asyncio.wait(tasks, timeout=DISCONNECT_TIMEOUT))
+        try:
+            self.loop.run_until_complete(asyncio.wait_for(self.ble.disconnect(), timeout=DISCONNECT_TIMEOUT))
+        except Exception:
+            pass
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
+
 
 def main():
-    root = tk.Tk()
-    app = App(root)
-    root.mainloop()
+    listener = _start_error_log()
+    try:
+        root = tk.Tk()
+        app = App(root)
+        try:
+            root.mainloop()
+        finally:
+            app.shutdown()
+    finally:
+        # flush pending repeat counts and queued records to disk before the process exits
+        _repeat_filter.flush()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
 
 
 if __name__ == "__main__":